@@ -3,7 +3,7 @@ import asyncio
 from typing import AsyncGenerator
 from typing_extensions import override
 
-from google.adk.agents import LlmAgent, BaseAgent, LoopAgent, SequentialAgent
+from google.adk.agents import LlmAgent, BaseAgent, LoopAgent, ParallelAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.genai import types
 from google.adk.sessions import InMemorySessionService
@@ -40,15 +40,15 @@ class StoryFlowAgent(BaseAgent):
     Custom agent for a story generation and refinement workflow.
 
     This agent orchestrates a sequence of LLM agents to generate a story,
-    critique it, revise it, check grammar and tone, and potentially
-    regenerate the story if the tone is negative.
+    critique it, revise it, check grammar and tone in parallel, and
+    potentially regenerate the story if the tone is negative.
     """
 
     # --- Field Declarations for Pydantic ---
     # Declare the agents passed during initialization as class attributes with type hints
     story_generator: LlmAgent
     loop_agent: LoopAgent
-    sequential_agent: SequentialAgent
+    parallel_agent: ParallelAgent
 
     # model_config allows setting Pydantic configurations if needed, e.g., arbitrary_types_allowed
     model_config = {"arbitrary_types_allowed": True}
@@ -77,7 +77,9 @@ class StoryFlowAgent(BaseAgent):
         loop_agent = LoopAgent(
             name="CriticReviserLoop", sub_agents=[critic, reviser], max_iterations=2
         )
-        sequential_agent = SequentialAgent(
+        # Grammar and tone checks only read 'current_story' and write distinct
+        # output keys, so they can run concurrently.
+        parallel_agent = ParallelAgent(
             name="PostProcessing", sub_agents=[grammar_check, tone_check]
         )
 
@@ -85,7 +87,7 @@ class StoryFlowAgent(BaseAgent):
         sub_agents_list = [
             story_generator,
             loop_agent,
-            sequential_agent,
+            parallel_agent,
         ]
 
         # Pydantic will validate and assign them based on the class annotations.
@@ -93,7 +95,7 @@ class StoryFlowAgent(BaseAgent):
             name=name,
             story_generator=story_generator,
             loop_agent=loop_agent,
-            sequential_agent=sequential_agent,
+            parallel_agent=parallel_agent,
             sub_agents=sub_agents_list,  # Pass the sub_agents list directly
         )
 
@@ -130,10 +132,10 @@ class StoryFlowAgent(BaseAgent):
 
         logger.info(f"[{self.name}] Story state after loop: {ctx.session.state.get('current_story')}")
 
-        # 3. Sequential Post-Processing (Grammar and Tone Check)
+        # 3. Parallel Post-Processing (Grammar and Tone Check)
         logger.info(f"[{self.name}] Running PostProcessing...")
-        # Use the sequential_agent instance attribute assigned during init
-        async for event in self.sequential_agent.run_async(ctx):
+        # Use the parallel_agent instance attribute assigned during init
+        async for event in self.parallel_agent.run_async(ctx):
             logger.info(f"[{self.name}] Event from PostProcessing: {event.model_dump_json(indent=2, exclude_none=True)}")
             yield event
 
@@ -0,0 +1,39 @@
+from typing import Literal, Optional
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+
+from .shared_model import gemini_2_flash
+
+
+def make_agent(
+    name: str,
+    instruction: str,
+    output_key: str,
+    max_output_tokens: int,
+    include_contents: Literal["default", "none"] = "none",
+    stop_sequences: Optional[list[str]] = None,
+) -> LlmAgent:
+    """
+    Builds a story subagent on the shared Gemini model.
+
+    Args:
+        name: The name of the agent.
+        instruction: The agent's prompt, usually referencing state placeholders.
+        output_key: The session state key the agent's response is saved to.
+        max_output_tokens: Upper bound on the tokens the model may generate.
+        include_contents: Whether the conversation history is sent to the model.
+        stop_sequences: Optional sequences that end generation early.
+    """
+    return LlmAgent(
+        name=name,
+        model=gemini_2_flash,
+        instruction=instruction,
+        include_contents=include_contents,
+        input_schema=None,
+        generate_content_config=types.GenerateContentConfig(
+            max_output_tokens=max_output_tokens,
+            stop_sequences=stop_sequences,
+        ),
+        output_key=output_key,
+    )
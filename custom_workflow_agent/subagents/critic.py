@@ -1,25 +1,18 @@
-import logging
-from google.adk.agents import LlmAgent
+from ._factory import make_agent
 
 
-# --- Configure Logging ---
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-GEMINI_2_FLASH = "gemini-2.0-flash"
-
 PROMPT = """
 You are a story critic. Review the story provided in
 session state with key 'current_story'. Provide 1-2 sentences of constructive criticism
 on how to improve it. Focus on plot or character.
-"""
 
+Story:
+{current_story}
+"""
 
-critic = LlmAgent(
+critic = make_agent(
     name="Critic",
-    model=GEMINI_2_FLASH,
     instruction=PROMPT,
-    input_schema=None,
     output_key="criticism",  # Key for storing criticism in session state
-)
\ No newline at end of file
+    max_output_tokens=128,
+)
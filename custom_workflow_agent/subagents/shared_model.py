@@ -0,0 +1,9 @@
+from google.adk.models import Gemini
+
+
+GEMINI_2_FLASH = "gemini-2.0-flash"
+
+# A single model instance shared by every subagent. When an LlmAgent is given
+# the model name as a string, ADK resolves a fresh Gemini wrapper (and with it a
+# new API client) each time the model is used.
+gemini_2_flash = Gemini(model=GEMINI_2_FLASH)
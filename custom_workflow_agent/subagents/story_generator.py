@@ -1,19 +1,14 @@
-import logging
-from google.adk.agents import LlmAgent
+from ._factory import make_agent
 
 
-# --- Configure Logging ---
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+PROMPT = """You are a story writer. Write a short story (around 100 words) about a cat,
+based on the topic provided in session state with key 'topic'"""
 
-
-GEMINI_2_FLASH = "gemini-2.0-flash"
-
-story_generator = LlmAgent(
+story_generator = make_agent(
     name="StoryGenerator",
-    model=GEMINI_2_FLASH,
-    instruction="""You are a story writer. Write a short story (around 100 words) about a cat,
-based on the topic provided in session state with key 'topic'""",
-    input_schema=None,
+    instruction=PROMPT,
     output_key="current_story",  # Key for storing output in session state
-)
\ No newline at end of file
+    max_output_tokens=512,
+    # The topic comes from the user's message, so keep the conversation
+    include_contents="default",
+)
@@ -1,23 +1,19 @@
-import logging
-from google.adk.agents import LlmAgent
+from ._factory import make_agent
 
 
-# --- Configure Logging ---
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-GEMINI_2_FLASH = "gemini-2.0-flash"
-
 PROMPT = """You are a tone analyzer. Analyze the tone of the story
 provided in session state with key 'current_story'. Output only one word: 'positive' if
 the tone is generally positive, 'negative' if the tone is generally negative, or 'neutral'
-otherwise."""
+otherwise.
+
+Story:
+{current_story}
+"""
 
-tone_check = LlmAgent(
+tone_check = make_agent(
     name="ToneCheck",
-    model=GEMINI_2_FLASH,
     instruction=PROMPT,
-    input_schema=None,
-    output_key="tone_check_result", # This agent's output determines the conditional flow
-)
\ No newline at end of file
+    output_key="tone_check_result",  # This agent's output determines the conditional flow
+    max_output_tokens=8,
+    stop_sequences=["\n"],
+)
@@ -1,11 +1,13 @@
 import asyncio
 import os
+import re
 from google.adk.agents import LoopAgent, LlmAgent, BaseAgent, SequentialAgent
 from google.genai import types
 from google.adk.runners import InMemoryRunner
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.tools.tool_context import ToolContext
 from typing import AsyncGenerator, Optional
+from typing_extensions import override
 from google.adk.events import Event, EventActions
 
 # --- Constants ---
@@ -17,47 +19,17 @@ STATE_INITIAL_TOPIC = "initial_topic"
 
 # --- State Keys ---
 STATE_CURRENT_DOC = "current_document"
-STATE_CRITICISM = "criticism"
-# Define the exact phrase the Critic should use to signal completion
-COMPLETION_PHRASE = "No major issues found."
+STATE_DIAGRAM_BODY = "diagram_body"
+STATE_SKIP_REFINEMENT = "skip_refinement"
 
-# --- Tool Definition ---
-def exit_loop(tool_context: ToolContext):
-  """Call this function ONLY when the critique indicates no further changes are needed, signaling the iterative process should end."""
-  print(f"  [Tool Call] exit_loop triggered by {tool_context.agent_name}")
-  tool_context.actions.escalate = True
-  # Return empty dict as tools should typically return JSON-serializable output
-  return {}
-
-
-
-# --- PROMPTS ---
-
-# --- PROMPTS ---
-
-PROMPT_INPUT_MAPPING = """
-You are a simple passthrough agent. Your only job is to take the user's input and place it into the 'initial_topic' state.
-
-Output the user input exactly as you received it, with no changes or additions.
-"""
-
-PROMPT_INITIAL_WRITER = f"""
-You are an expert Software Architect. Your task is to create an initial architectural diagram in PlantUML based on the user's request.
-
-**User Request:**
-{{{{initial_topic}}}}
-
-**Styling Requirements:**
-- The diagram must have a professional, polished appearance.
-- You **MUST** create a title for the diagram based on the user's request.
-- You **MUST** include the following `skinparam` block at the beginning of your PlantUML code to enforce the style. This style removes borders, sets arrow colors to black, and increases title size.
-
-```plantuml
-' Style Settings
-title
-<size:20>{{{{initial_topic}}}}</size>
-end title
+# --- Static Diagram Styling ---
+# The title and skinparam block never change between iterations, so they are
+# added in Python rather than regenerated by the model on every call.
+TITLE_TEMPLATE = """title
+<size:20>{topic}</size>
+end title"""
 
+STYLE_HEADER = """' Style Settings
 skinparam handwritten false
 skinparam roundcorner 5
 skinparam shadowing false
@@ -67,41 +39,102 @@ skinparam arrowColor black
 skinparam titleFontSize 20
 
 ' Color Palette (Borders are same as background to remove outlines)
-skinparam rectangle {{
+skinparam rectangle {
   BackgroundColor lightblue
   BorderColor lightblue
-}}
-skinparam component {{
+}
+skinparam component {
   BackgroundColor lightblue
   BorderColor lightblue
-}}
-skinparam database {{
+}
+skinparam database {
   BackgroundColor lightgray
   BorderColor lightgray
-}}
-skinparam actor {{
+}
+skinparam actor {
   BackgroundColor lightgray
   BorderColor lightgray
-}}
-```
+}"""
+
+# Prefixes of lines the model may still emit around the body (code fences of
+# any language tag, named @startuml markers); the styler owns these.
+_WRAPPER_PREFIXES = ("```", "@startuml", "@enduml")
+
+# --- Quick Validation ---
+# Short requests whose first draft already passes these structural checks skip
+# the review loop entirely.
+QUICK_VALIDATE_MAX_TOPIC_WORDS = 15
+_ELEMENT_RE = re.compile(
+    r"^\s*(actor|component|database|rectangle|node|package|queue|cloud|frame)\b",
+    re.MULTILINE,
+)
+_RELATIONSHIP_RE = re.compile(r"\S\s*(-+|\.+)>\s*\S|\S\s*<(-+|\.+)\s*\S")
+_NOTE_PREFIXES = ("note ", "hnote ", "rnote ")
+
+
+def _structural_lines(body: str) -> list[str]:
+    """Returns the diagram body lines outside comments and notes."""
+    lines = []
+    in_comment = False
+    note_end = None
+    for line in body.splitlines():
+        stripped = line.strip()
+        if in_comment:
+            in_comment = not stripped.endswith("'/")
+        elif note_end:
+            if stripped.lower().replace(" ", "") == note_end:
+                note_end = None
+        elif stripped.startswith("/'"):
+            in_comment = not stripped[2:].endswith("'/")
+        elif stripped.startswith("'"):
+            continue
+        elif stripped.lower().startswith(_NOTE_PREFIXES):
+            # Single-line notes use "note ... : text" or "note "text" as N1";
+            # anything else (e.g. "note as N1") opens a block closed by
+            # "end note", "end hnote" or "end rnote" to match the opener.
+            opener = stripped.split(None, 1)[0].lower()
+            if ":" not in stripped and '"' not in stripped:
+                note_end = "end" + opener
+        else:
+            lines.append(line)
+    return lines
+
+# --- Tool Definition ---
+def exit_loop(tool_context: ToolContext):
+  """Call this function ONLY when the critique indicates no further changes are needed, signaling the iterative process should end."""
+  print(f"  [Tool Call] exit_loop triggered by {tool_context.agent_name}")
+  tool_context.actions.escalate = True
+  # Return empty dict as tools should typically return JSON-serializable output
+  return {}
+
+
+
+# --- PROMPTS ---
+
+# --- PROMPTS ---
+
+PROMPT_INITIAL_WRITER = """
+You are an expert Software Architect. Your task is to create an initial architectural diagram in PlantUML based on the user's request.
+
+**User Request:**
+{initial_topic}
 
 **Instructions:**
-- Generate a complete PlantUML diagram that represents the core components and relationships described in the user's request.
-- Ensure the diagram starts with `@startuml`, includes the `title` block, and the full `skinparam` styling block provided above.
-- The diagram must end with `@enduml`.
+- Generate the body of a PlantUML diagram that represents the core components and relationships described in the user's request.
+- Output only the diagram body: components, relationships and notes. The `@startuml`/`@enduml` markers, the `title` block and the `skinparam` styling are added automatically, so do not include them.
 - Output *only* the raw PlantUML code. Do not include markdown code fences (like ```plantuml) or any other explanations.
 """
 
-PROMPT_CRITIC = f"""You are an expert Software Architect and PlantUML code reviewer. Your goal is to provide concise, actionable feedback on a PlantUML diagram draft.
+PROMPT_REVIEWER = """You are an expert Software Architect and PlantUML code reviewer. Your task is to review a PlantUML diagram draft and, in the same response, either refine it or finish the process.
 
     **Initial User Request:**
     ```
-    {{{{initial_topic}}}}
+    {initial_topic}
     ```
 
-    **PlantUML Diagram to Review:**
+    **Current PlantUML Diagram Body:**
     ```plantuml
-    {{{{current_document}}}}
+    {diagram_body}
     ```
 
     **Task:**
@@ -109,111 +142,221 @@ PROMPT_CRITIC = f"""You are an expert Software Architect and PlantUML code revie
     1.  **Syntax Correctness:** Is the PlantUML syntax valid?
     2.  **Component Accuracy:** Does the diagram include all the key components mentioned in the request?
     3.  **Relationship Clarity:** Are the relationships and data flows between components logical and clearly represented?
-    4.  **Styling Requirements:** Does the diagram have a large title? Does it include a `skinparam` block that removes box outlines (border color same as background) and sets arrow color to black?
-    5.  **Completeness:** Is the diagram a reasonable interpretation of the user's request?
+    4.  **Completeness:** Is the diagram a reasonable interpretation of the user's request?
 
     **Response Format:**
-    -   IF you find specific, critical issues (e.g., "Missing the database component," "Arrows are red, should be black," "Box outlines are visible"), provide a brief, one or two-line critique.
+    -   IF you find specific, critical issues (e.g., "Missing the database component," "Relationship direction is wrong"):
+        Fix them in the 'Current PlantUML Diagram Body'.
+        Output *only* the complete, refined diagram body. Do not include `@startuml`/`@enduml`, a `title` block or `skinparam` settings; these are added automatically.
     -   ELSE IF the diagram is a solid and complete representation of the request with no major errors:
-        Respond *exactly* with the phrase "{COMPLETION_PHRASE}" and nothing else.
+        You **MUST** call the 'exit_loop' function immediately. Do not output any text.
 
-    Output only the critique OR the exact completion phrase.
+    Do not add explanations. Either output the refined diagram body OR call the `exit_loop` function.
 """
 
 
-PROMPT_REFINER = f"""
-You are a Software Architect AI. Your task is to refine a PlantUML diagram based on a critique OR to finalize the process.
-
-    **Current PlantUML Diagram:**
-    ```plantuml
-    {{{{current_document}}}}
-    ```
-
-    **Critique/Suggestions:**
-    {{{{criticism}}}}
-
-    **Task:**
-    Carefully analyze the 'Critique/Suggestions'.
-
-    -   IF the critique is *exactly* "{COMPLETION_PHRASE}":
-        You **MUST** call the 'exit_loop' function immediately. Do not output any text.
-
-    -   ELSE (the critique contains actionable feedback):
-        Apply the suggestions to improve the 'Current PlantUML Diagram'.
-        **Crucially, you must preserve the polished styling.** This includes the large title and the `skinparam` settings (no outlines, black arrows). If the styling was missing or incorrect, re-insert the correct styling block.
-        Output *only* the complete, refined PlantUML code. Ensure it starts with `@startuml` and ends with `@enduml`.
-
-    Do not add explanations. Either output the refined PlantUML code OR call the `exit_loop` function.
-"""
+# --- Custom Input Mapper Agent ---
+class InputMapperAgent(BaseAgent):
+    """
+    Copies the user's message into the 'initial_topic' state key.
+
+    This is a pure passthrough, so it is done in Python instead of asking
+    an LLM to echo the input back.
+    """
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Writes the text of the current user message to state."""
+        parts = ctx.user_content.parts if ctx.user_content and ctx.user_content.parts else []
+        topic = "".join(part.text for part in parts if part.text)
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={STATE_INITIAL_TOPIC: topic}),
+        )
+
+
+# --- Custom Styler Agent ---
+class DiagramStylerAgent(BaseAgent):
+    """
+    Wraps the model-generated diagram body with the static title and styling.
+
+    Reads the body from state key 'diagram_body', strips any wrapper lines the
+    model emitted, and writes both the cleaned body back to 'diagram_body' and
+    the complete PlantUML document to 'current_document' without an LLM call.
+    """
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Assembles the styled PlantUML document from the current body."""
+        body = ctx.session.state.get(STATE_DIAGRAM_BODY, "")
+        body_lines = [
+            line for line in body.strip().splitlines()
+            if not line.strip().startswith(_WRAPPER_PREFIXES)
+        ]
+        body = "\n".join(body_lines)
+        topic = ctx.session.state.get(STATE_INITIAL_TOPIC, "").strip()
+        document = "\n".join([
+            "@startuml",
+            TITLE_TEMPLATE.format(topic=topic),
+            "",
+            STYLE_HEADER,
+            "",
+            body,
+            "@enduml",
+        ])
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=document)]),
+            # Write the cleaned body back so the reviewer and validator see it too
+            actions=EventActions(state_delta={
+                STATE_DIAGRAM_BODY: body,
+                STATE_CURRENT_DOC: document,
+            }),
+        )
+
+
+# --- Custom Quick Validator Agent ---
+class QuickValidatorAgent(BaseAgent):
+    """
+    Decides, without an LLM call, whether the initial draft needs review.
+
+    Sets state key 'skip_refinement' when the user request is short and the
+    diagram body, ignoring comments and notes, declares at least one element
+    and one relationship with balanced braces.
+    """
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Runs the structural checks on the initial diagram body."""
+        topic = ctx.session.state.get(STATE_INITIAL_TOPIC, "")
+        # Runs after InitialStylerAgent, so this is the cleaned body
+        body = ctx.session.state.get(STATE_DIAGRAM_BODY, "")
+        structure = "\n".join(_structural_lines(body))
+        skip_refinement = (
+            len(topic.split()) <= QUICK_VALIDATE_MAX_TOPIC_WORDS
+            and _ELEMENT_RE.search(structure) is not None
+            and _RELATIONSHIP_RE.search(structure) is not None
+            and structure.count("{") == structure.count("}")
+        )
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={STATE_SKIP_REFINEMENT: skip_refinement}),
+        )
+
+
+# --- Custom Refinement Gate Agent ---
+class RefinementGateAgent(BaseAgent):
+    """Exits the enclosing loop when 'skip_refinement' is set in state."""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Escalates out of the loop if the quick validator passed the draft."""
+        if ctx.session.state.get(STATE_SKIP_REFINEMENT):
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(escalate=True),
+            )
 
 
 # --- Agent Definitions ---
 
 # STEP 1: Input Mapping Agent (Handles initial user query)
-input_mapping_agent = LlmAgent(
+input_mapping_agent = InputMapperAgent(
     name="InputMapper",
-    model=GEMINI_MODEL,
-    include_contents="default",
-    instruction=PROMPT_INPUT_MAPPING,
     description="Maps the initial user query to the 'initial_topic' state variable.",
-    output_key=STATE_INITIAL_TOPIC,
 )
 
-# STEP 2: Initial Writer Agent (Runs ONCE at the beginning)
+# STEP 2a: Initial Writer Agent (Runs ONCE at the beginning)
 initial_writer_agent = LlmAgent(
     name="InitialWriterAgent",
     model=GEMINI_MODEL,
     include_contents='none',
     instruction=PROMPT_INITIAL_WRITER,
-    description="Writes the initial PlantUML diagram based on the user's request.",
-    output_key=STATE_CURRENT_DOC
+    description="Writes the initial PlantUML diagram body based on the user's request.",
+    output_key=STATE_DIAGRAM_BODY
 )
 
-# STEP 2a: Critic Agent (Inside the Refinement Loop)
-critic_agent_in_loop = LlmAgent(
-    name="CriticAgent",
-    model=GEMINI_MODEL,
-    include_contents='none',
-    instruction=PROMPT_CRITIC,
-    description="Reviews the current PlantUML diagram, providing critique if improvements are needed, otherwise signals completion.",
-    output_key=STATE_CRITICISM
+# STEP 2b: Styler Agent (Runs ONCE after the initial writer)
+initial_styler_agent = DiagramStylerAgent(
+    name="InitialStylerAgent",
+    description="Adds the static title and styling to the initial diagram body.",
 )
 
+# STEP 2c: Quick Validator Agent (Runs ONCE before the refinement loop)
+quick_validator_agent = QuickValidatorAgent(
+    name="QuickValidatorAgent",
+    description="Checks whether a simple request's initial diagram can skip the review loop.",
+)
 
-# STEP 2b: Refiner/Exiter Agent (Inside the Refinement Loop)
-refiner_agent_in_loop = LlmAgent(
-    name="RefinerAgent",
+# STEP 3a: Refinement Gate Agent (Inside the Refinement Loop)
+refinement_gate_agent = RefinementGateAgent(
+    name="RefinementGateAgent",
+    description="Exits the refinement loop when the quick validator passed the initial diagram.",
+)
+
+# STEP 3b: Reviewer Agent (Inside the Refinement Loop)
+# Critiques and refines in a single LLM call, or calls exit_loop when done.
+reviewer_agent_in_loop = LlmAgent(
+    name="ReviewerAgent",
     model=GEMINI_MODEL,
     # Relies solely on state via placeholders
     include_contents='none',
-    instruction=PROMPT_REFINER,
-    description="Refines the PlantUML diagram based on critique, or calls exit_loop if critique indicates completion.",
+    instruction=PROMPT_REVIEWER,
+    description="Reviews the PlantUML diagram and refines it in one step, or calls exit_loop if no major issues remain.",
     tools=[exit_loop], # Provide the exit_loop tool
-    output_key=STATE_CURRENT_DOC # Overwrites state['current_document'] with the refined version
+    output_key=STATE_DIAGRAM_BODY # Overwrites state['diagram_body'] with the refined version
+)
+
+# STEP 3c: Styler Agent (Inside the Refinement Loop)
+refinement_styler_agent = DiagramStylerAgent(
+    name="RefinementStylerAgent",
+    description="Adds the static title and styling to the refined diagram body.",
 )
 
 
-# STEP 2: Refinement Loop Agent
+# STEP 3: Refinement Loop Agent
 refinement_loop = LoopAgent(
     name="RefinementLoop",
-    # Agent order is crucial: Critique first, then Refine/Exit
+    # Agent order is crucial: Gate first, then Review/Exit, then re-apply styling
     sub_agents=[
-        critic_agent_in_loop,
-        refiner_agent_in_loop,
+        refinement_gate_agent,
+        reviewer_agent_in_loop,
+        refinement_styler_agent,
     ],
     max_iterations=5 # Limit loops
 )
 
-# STEP 3: Overall Sequential Pipeline
+# STEP 4: Overall Sequential Pipeline
 # For ADK tools compatibility, the root agent must be named `root_agent`
 root_agent = SequentialAgent(
     name="IterativePlantumlPipeline",
     sub_agents=[
         input_mapping_agent,  # NEW: First, map the user input to state
         initial_writer_agent, # Then, run the writer
-        refinement_loop       # Finally, run the critique/refine loop
+        initial_styler_agent, # Add the static styling to the first draft
+        quick_validator_agent, # Decide whether simple drafts can skip review
+        refinement_loop       # Finally, run the review/refine loop
     ],
-    description="Generates an initial PlantUML diagram and then iteratively refines it with critique using an exit tool."
+    description="Generates an initial PlantUML diagram and then iteratively reviews and refines it using an exit tool."
 )
 
 
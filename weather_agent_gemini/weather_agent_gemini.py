@@ -5,6 +5,7 @@ from google.adk.runners import Runner
 from google.genai import types
 
 import logging
+from types import MappingProxyType
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,6 +14,25 @@ logger = logging.getLogger(__name__)
 MODEL_GEMINI_2_0_FLASH = "gemini-2.5-flash-preview-05-20"
 
 
+# Mock the weather data for newyork, london, tokyo as a dictionary.
+# Keys are already normalized (lowercase, no spaces) so lookups are direct.
+# Read-only so no caller can change the data seen by later tool calls.
+WEATHER_DATA = MappingProxyType({
+    "newyork": {
+        "status": "success",
+        "report": "The weather in New York is sunny with a temperature of 25°C."
+    },
+    "london": {
+        "status": "success",
+        "report": "It's cloudy in London with a temperature of 15°C."
+    },
+    "tokyo": {
+        "status": "success",
+        "report": "Tokyo is experiencing light rain and a temperature of 18°C."
+    }
+})
+
+
 def get_weather(city: str) -> dict:
     """Retrieves the current weather report for a specified city.
 
@@ -25,34 +45,17 @@ def get_weather(city: str) -> dict:
               If 'success', includes a 'report' key with weather details.
               If 'error', includes an 'error_message' key.
     """
-    assert isinstance(city, str), "City must be a string"
     logger.info("--- Tool Call: Getting weather for %s ---", city)
     city_normalized = city.lower().replace(" ", "")
 
-
-    # Mock the weather data for newyork, london, tokyo as a dictionary
-    weather_data = {
-        "newyork": {
-            "status": "success",
-            "report": "The weather in New York is sunny with a temperature of 25°C."
-        },
-        "london": {
-            "status": "success",
-            "report": "It's cloudy in London with a temperature of 15°C."
-        },
-        "tokyo": {
-            "status": "success",
-            "report": "Tokyo is experiencing light rain and a temperature of 18°C."
-        }
-    } 
-
-    if city_normalized in weather_data:
-        return weather_data[city_normalized]
-    else:
-        return {
-            "status": "error",
-            "error_message": f"The weather for {city} not available."
-        }
+    report = WEATHER_DATA.get(city_normalized)
+    if report is not None:
+        # Return a copy so callers cannot mutate the shared report
+        return dict(report)
+    return {
+        "status": "error",
+        "error_message": f"The weather for {city} not available."
+    }
 
 # # Example tool usage (optional tests)
 # print(get_weather("New York"))